@@ -1,50 +1,324 @@
 # agents/scholar_agent.py
+import asyncio
+import hashlib
+import json
+import logging
 import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from typing import TypedDict, Annotated, Sequence
+from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage, ToolMessage
-from langchain_openai import ChatOpenAI
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
 from langgraph.graph import StateGraph, END
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.constants import TAG_NOSTREAM
 from langgraph.prebuilt import ToolNode
 from core.tools.library_tools import LIBRARY_TOOLS
-from agents.prompts import SCHOLAR_BOT_SYSTEM_PROMPT
+from agents.prompts import CONVERSATION_SUMMARY_PROMPT, SCHOLAR_BOT_SYSTEM_PROMPT_CONCISE
 from core.utils.logging_utils import get_logger
 import operator
 
-try:
-    from langchain_groq import ChatGroq
-except ImportError:
-    ChatGroq = None
-
 _log = get_logger(__name__)
 
+# Message roles are checked with `type(m) is X` on hot paths: LangGraph state only holds
+# the concrete message classes, and an identity check is cheaper than isinstance().
+# AIMessage keeps isinstance() since streamed replies may be AIMessageChunk.
+
+# Maximum number of (thread_id, thread position, normalized input) responses kept per agent
+RESPONSE_CACHE_SIZE = 256
+
+# Hard cap on conversation messages (after any summary) sent to the LLM per call
+MAX_CONTEXT_MESSAGES = 20
+
+# Once more than SUMMARIZE_AFTER_MESSAGES messages are unsummarized, older turns are
+# folded into a running summary and only the last ~KEEP_RECENT_MESSAGES stay verbatim
+SUMMARIZE_AFTER_MESSAGES = 12
+KEEP_RECENT_MESSAGES = 6
+
+# Library search arguments remembered as read-only "slots" for follow-up turns
+SEARCH_SLOT_KEYS = ("query", "resource_type", "date_from", "date_to")
+
+
+def _create_chat_model(provider: str, **kwargs) -> BaseChatModel:
+    """Instantiate the chat model for a provider, importing only that provider's integration."""
+    if provider == "groq":
+        try:
+            from langchain_groq import ChatGroq
+        except ImportError:
+            raise ImportError("Groq provider requested but langchain-groq is not installed. Run: pip install langchain-groq")
+        return ChatGroq(**kwargs)
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(**kwargs)
+
+
+# Checkpoint store used when SCHOLARBOT_CHECKPOINT_BACKEND is unset, so threads survive
+# restarts; it lives in DATA_DIR (the mounted volume under Docker)
+DEFAULT_CHECKPOINT_BACKEND = "sqlite:///" + os.path.join(os.getenv("DATA_DIR", "/data"), "scholarbot_ckpt.db")
+
+# Process-wide checkpointer shared by all agents (see _shared_checkpointer)
+_SHARED_MEMORY: BaseCheckpointSaver | None = None
+_SHARED_MEMORY_LOCK = threading.Lock()
+
+
+def _create_checkpointer(backend: str) -> BaseCheckpointSaver:
+    """Build a checkpointer from a backend spec: "memory" or "sqlite:///path/to.db"."""
+    if backend.startswith("sqlite:///"):
+        try:
+            from langgraph.checkpoint.sqlite import SqliteSaver
+        except ImportError:
+            raise ImportError(
+                "SQLite checkpoint backend requested but langgraph-checkpoint-sqlite is not installed. "
+                "Run: pip install langgraph-checkpoint-sqlite"
+            )
+        
+        class _ThreadedSqliteSaver(SqliteSaver):
+            """
+            SqliteSaver whose async methods run the sync ones in a worker thread, so
+            achat()/astream_chat() work too (the connection is shared under its lock).
+            """
+            
+            async def aget_tuple(self, config):
+                return await asyncio.to_thread(self.get_tuple, config)
+            
+            async def alist(self, config, **kwargs):
+                for item in await asyncio.to_thread(lambda: list(self.list(config, **kwargs))):
+                    yield item
+            
+            async def aput(self, *args, **kwargs):
+                return await asyncio.to_thread(self.put, *args, **kwargs)
+            
+            async def aput_writes(self, *args, **kwargs):
+                return await asyncio.to_thread(self.put_writes, *args, **kwargs)
+            
+            async def adelete_thread(self, thread_id):
+                return await asyncio.to_thread(self.delete_thread, thread_id)
+        
+        path = backend[len("sqlite:///"):]
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _log.info(f"Using SQLite checkpointer at {path}")
+        return _ThreadedSqliteSaver(sqlite3.connect(path, check_same_thread=False))
+    if backend != "memory":
+        raise ValueError(f"Unsupported SCHOLARBOT_CHECKPOINT_BACKEND: {backend!r} (use 'memory' or 'sqlite:///path.db')")
+    return MemorySaver()
+
+
+def _shared_checkpointer() -> BaseCheckpointSaver:
+    """Return the process-wide checkpointer, creating it from SCHOLARBOT_CHECKPOINT_BACKEND on first use."""
+    global _SHARED_MEMORY
+    with _SHARED_MEMORY_LOCK:
+        if _SHARED_MEMORY is None:
+            backend = os.getenv("SCHOLARBOT_CHECKPOINT_BACKEND")
+            try:
+                _SHARED_MEMORY = _create_checkpointer(backend or DEFAULT_CHECKPOINT_BACKEND)
+            except (ImportError, OSError, sqlite3.Error) as e:
+                if backend:
+                    raise
+                # Only the implicit default falls back (e.g. DATA_DIR not writable on a
+                # dev machine); an explicit backend must be honored
+                _log.warning(f"{e}. Falling back to in-memory conversation state.")
+                _SHARED_MEMORY = MemorySaver()
+        return _SHARED_MEMORY
+
+
+# Known API error markers (matched against the lowercased error text) and their user-facing messages
+_ERROR_PATTERNS: tuple[tuple[tuple[str, ...], str], ...] = (
+    (
+        ("429", "insufficient_quota", "quota", "rate_limit"),
+        "Usage or rate limit reached. Check your provider's billing/limits "
+        "(Groq: https://console.groq.com  or OpenAI: https://platform.openai.com/account/billing) "
+        "or try again later.",
+    ),
+    (
+        ("401", "invalid_api_key", "authentication"),
+        "Invalid or missing API key. Set GROQ_API_KEY (for Groq) or OPENAI_API_KEY (for OpenAI) in your .env file. "
+        "Groq: https://console.groq.com/keys  |  OpenAI: https://platform.openai.com/api-keys",
+    ),
+    (
+        ("404", "model_not_found"),
+        "The selected model isn't available. Set GROQ_MODEL (e.g. llama-3.1-8b-instant) or "
+        "OPENAI_MODEL (e.g. gpt-4o-mini) in .env depending on your provider.",
+    ),
+)
+
 
 def _user_facing_error(exc: Exception) -> str:
     """Return a short, actionable message for known API errors."""
     msg = str(exc).lower()
-    if "429" in str(exc) or "insufficient_quota" in msg or "quota" in msg or "rate_limit" in msg:
-        return (
-            "Usage or rate limit reached. Check your provider's billing/limits "
-            "(Groq: https://console.groq.com  or OpenAI: https://platform.openai.com/account/billing) "
-            "or try again later."
-        )
-    if "401" in str(exc) or "invalid_api_key" in msg or "authentication" in msg:
-        return (
-            "Invalid or missing API key. Set GROQ_API_KEY (for Groq) or OPENAI_API_KEY (for OpenAI) in your .env file. "
-            "Groq: https://console.groq.com/keys  |  OpenAI: https://platform.openai.com/api-keys"
-        )
-    if "404" in str(exc) or "model_not_found" in msg:
-        return (
-            "The selected model isn't available. Set GROQ_MODEL (e.g. llama-3.1-8b-instant) or "
-            "OPENAI_MODEL (e.g. gpt-4o-mini) in .env depending on your provider."
-        )
+    for keys, user_msg in _ERROR_PATTERNS:
+        if any(k in msg for k in keys):
+            return user_msg
     return f"Something went wrong: {exc}. Please try again or rephrase your question."
 
 
+def hash_thread_id(thread_id: str, length: int = 32) -> str:
+    """
+    Return a stable one-way hash of a thread ID.
+    
+    Thread IDs reopen whole conversations (the app's ?thread= parameter), so they are
+    never sent to providers or written to logs; this hash is used instead.
+    """
+    return hashlib.sha256(str(thread_id).encode("utf-8")).hexdigest()[:length]
+
+
+def _trim_history(messages: Sequence[BaseMessage]) -> Sequence[BaseMessage]:
+    """
+    Keep the most recent conversation messages, up to MAX_CONTEXT_MESSAGES.
+    
+    The window never starts on a ToolMessage, so a tool result is never sent without
+    the AIMessage that requested it.
+    """
+    if len(messages) <= MAX_CONTEXT_MESSAGES:
+        return messages
+    start = len(messages) - MAX_CONTEXT_MESSAGES
+    while start > 0 and type(messages[start]) is ToolMessage:
+        start -= 1
+    return messages[start:]
+
+
+def _search_slots(messages: Sequence[BaseMessage]) -> dict | None:
+    """Return the arguments of the most recent library search in the thread, if any."""
+    for m in reversed(messages):
+        if isinstance(m, AIMessage):
+            for call in reversed(m.tool_calls or []):
+                if call.get("name") == "get_library_resources":
+                    args = call.get("args") or {}
+                    return {k: args.get(k) for k in SEARCH_SLOT_KEYS}
+    return None
+
+
+def _context_message(summary: str, slots: dict | None) -> SystemMessage | None:
+    """Build the per-thread context block (summary + search slots) sent after the static prompt."""
+    parts = []
+    if summary:
+        parts.append(f"Summary of the earlier conversation:\n{summary}")
+    if slots:
+        parts.append(
+            "Current search slots (read-only; reuse them for follow-up refinements): "
+            + json.dumps(slots, sort_keys=True)
+        )
+    return SystemMessage(content="\n\n".join(parts)) if parts else None
+
+
+def _transcript(messages: Sequence[BaseMessage]) -> str:
+    """Render messages as plain text lines for the summarizer."""
+    lines = []
+    for m in messages:
+        if type(m) is HumanMessage:
+            lines.append(f"User: {m.content}")
+        elif type(m) is ToolMessage:
+            lines.append(f"Search results: {str(m.content)[:500]}")
+        elif isinstance(m, AIMessage):
+            for call in m.tool_calls or []:
+                lines.append(f"Assistant searched the library with {json.dumps(call.get('args') or {}, sort_keys=True)}")
+            if m.content:
+                lines.append(f"Assistant: {m.content}")
+    return "\n".join(lines)
+
+
+def _compose_response(tool_parts: list[str], final_message: BaseMessage | None) -> str:
+    """
+    Build the user-facing reply for a turn.
+    
+    Tool results from the turn are always included so the user sees search results
+    (the LLM sometimes replies with only a follow-up question and omits them).
+    """
+    if isinstance(final_message, AIMessage):
+        response = (final_message.content or "").strip()
+    else:
+        response = str(final_message or "").strip()
+
+    if tool_parts:
+        response = "\n\n".join(tool_parts) + ("\n\n---\n\n" + response if response else "")
+    return response
+
+
+class _StreamAssembler:
+    """
+    Turn LangGraph (mode, payload) items from stream_mode=["messages", "updates"] into
+    display text laid out like chat(): tool results, a separator, then the reply.
+    
+    Reply tokens come from "messages". Tool results and finished agent steps come from
+    "updates", so a step that streamed no tokens is still shown in full. Text the router
+    writes before calling tools is displayed but, as in chat(), not part of text().
+    """
+    
+    def __init__(self):
+        self.tool_parts: list[str] = []
+        self.final_message: BaseMessage | None = None
+        self._shown = False
+        self._after_tools = False
+        # Whether the current agent step has shown any reply text yet
+        self._step_started = False
+        # Agent messages already shown whole from "updates"; late duplicates are skipped
+        self._done_ids: set[str] = set()
+        # Messages the turn's node updates appended to the thread
+        self.added = 0
+    
+    def feed(self, mode: str, payload) -> str:
+        """Return the text to emit for one stream item (empty if nothing to show)."""
+        if mode == "messages":
+            message, metadata = payload
+            if (
+                isinstance(message, AIMessage)
+                and metadata.get("langgraph_node") == "agent"
+                and isinstance(message.content, str)
+                and message.content
+                and message.id not in self._done_ids
+            ):
+                return self._emit_reply(message.content)
+            return ""
+        
+        pieces = []
+        for node, update in payload.items():
+            messages = update.get("messages", []) if isinstance(update, dict) else []
+            if node in ("tools", "agent"):
+                self.added += len(messages)
+            if node == "tools":
+                for m in messages:
+                    if type(m) is ToolMessage and m.content:
+                        self.tool_parts.append(m.content)
+                        pieces.append(("\n\n" if self._shown else "") + m.content)
+                        self._shown = self._after_tools = True
+            elif node == "agent" and messages:
+                self.final_message = messages[-1]
+                content = self.final_message.content
+                if not self._step_started and isinstance(content, str) and content:
+                    pieces.append(self._emit_reply(content))
+                    if self.final_message.id:
+                        self._done_ids.add(self.final_message.id)
+                self._step_started = False
+        return "".join(pieces)
+    
+    def _emit_reply(self, text: str) -> str:
+        """Return reply text, prefixed with a separator when it starts a new section."""
+        if not self._step_started:
+            self._step_started = True
+            if self._after_tools:
+                text = "\n\n---\n\n" + text
+            elif self._shown:
+                text = "\n\n" + text
+            self._after_tools = False
+        self._shown = True
+        return text
+    
+    def text(self) -> str:
+        """Return the turn's reply exactly as chat() composes it."""
+        return _compose_response(self.tool_parts, self.final_message)
+
+
 # Define the state for our agent
 class AgentState(TypedDict):
     """State for the Scholar agent."""
     messages: Annotated[Sequence[BaseMessage], operator.add]
+    # Running summary of messages[:summarized_upto]; both absent until first summarized
+    summary: str
+    summarized_upto: int
 
 
 class ScholarAgent:
@@ -58,12 +332,17 @@ class ScholarAgent:
     - Multi-turn dialogue support
     """
     
+    # One chat model per (provider, model), shared by all agents so every router/responder
+    # variant (bound on top of it) uses the same HTTP client and connection pool
+    _LLM_CACHE: dict[tuple[str, str], BaseChatModel] = {}
+    
     def __init__(
         self,
         model_name: str | None = None,
         temperature: float = 0.7,
-        system_prompt: str = SCHOLAR_BOT_SYSTEM_PROMPT,
+        system_prompt: str = SCHOLAR_BOT_SYSTEM_PROMPT_CONCISE,
         provider: str | None = None,
+        memory: BaseCheckpointSaver | None = None,
     ):
         """
         Initialize the Scholar agent.
@@ -72,8 +351,12 @@ class ScholarAgent:
             model_name: Model to use (e.g. llama-3.1-8b-instant for Groq, gpt-4o-mini for OpenAI).
                         Defaults from GROQ_MODEL or OPENAI_MODEL per provider.
             temperature: Model temperature for response generation
-            system_prompt: System prompt defining agent behavior
+            system_prompt: System prompt defining agent behavior. Defaults to the concise prompt;
+                           pass agents.prompts.SCHOLAR_BOT_SYSTEM_PROMPT for the verbose one.
+                           Keep it static so provider-side prompt caching can reuse the prefix.
             provider: "groq" or "openai". Defaults to env LLM_PROVIDER, then "groq".
+            memory: Checkpointer for conversation state. Defaults to a process-wide one shared
+                    by all agents (configured via SCHOLARBOT_CHECKPOINT_BACKEND).
         """
         provider = (provider or os.getenv("LLM_PROVIDER", "groq")).lower()
         if model_name is None:
@@ -83,43 +366,136 @@ class ScholarAgent:
                 else os.getenv("OPENAI_MODEL", "gpt-4o-mini")
             )
         _log.info(f"Initializing ScholarAgent with provider={provider}, model={model_name}")
+        self.provider = provider
+        self.model_name = model_name
+        self.temperature = temperature
 
-        if provider == "groq":
-            if ChatGroq is None:
-                raise ImportError("Groq provider requested but langchain-groq is not installed. Run: pip install langchain-groq")
-            self.llm = ChatGroq(
-                model=model_name,
-                temperature=temperature,
-                streaming=True,
-            ).bind_tools(LIBRARY_TOOLS)
-        else:
-            self.llm = ChatOpenAI(
-                model=model_name,
-                temperature=temperature,
-                streaming=True,
-            ).bind_tools(LIBRARY_TOOLS)
+        # Router decides which searches to run: deterministic and allowed to emit
+        # several tool calls at once. Responder writes the reply after tool results.
+        # Both are bindings on one shared model. Tokens are only streamed when the graph
+        # runs in "messages" mode (stream_chat), so chat() never pays for SSE.
+        llm = self._shared_llm(provider, model_name)
+        self.llm_router = llm.bind_tools(LIBRARY_TOOLS, parallel_tool_calls=True).bind(temperature=0.0)
+        self.llm_responder = llm.bind(temperature=temperature)
+        # Folds older turns into the running conversation summary
+        self.llm_summarizer = llm.bind(temperature=0.0)
         
         self.system_prompt = system_prompt
+        self._system_message = SystemMessage(content=system_prompt)
         
         # Create the graph
         self.graph = self._create_graph()
         
-        # Initialize memory for stateful conversations
-        self.memory = MemorySaver()
+        # Memory for stateful conversations, shared across agents unless one is given
+        self.memory = memory or _shared_checkpointer()
         
         # Compile the graph with memory
         self.app = self.graph.compile(checkpointer=self.memory)
         
+        # LRU cache of final responses keyed by (thread_id, thread position, normalized input)
+        self._response_cache: OrderedDict[tuple[str, int, str], str] = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        
         _log.info("ScholarAgent initialized successfully")
     
+    @classmethod
+    def _shared_llm(cls, provider: str, model_name: str) -> BaseChatModel:
+        """Return the shared chat model for a provider and model, creating it on first use."""
+        key = (provider, model_name)
+        llm = cls._LLM_CACHE.get(key)
+        if llm is None:
+            llm = cls._LLM_CACHE.setdefault(key, _create_chat_model(provider, model=model_name))
+        return llm
+    
+    @staticmethod
+    def _cache_key(user_input: str, thread_id: str, position: int) -> tuple[str, int, str]:
+        """
+        Build the response cache key for a user message at a point in a thread.
+        
+        `position` is the thread's checkpointed message count. Replies are stored under
+        the count after their turn, so only an exact retry of the turn just answered hits;
+        the same words later in the conversation (e.g. "more") always run the graph.
+        """
+        return (thread_id, position, user_input.strip().lower())
+    
+    def _thread_length(self, config: RunnableConfig) -> int:
+        """Return the number of messages checkpointed for the config's thread."""
+        snapshot = self.app.get_state(config)
+        return len(snapshot.values.get("messages", [])) if snapshot else 0
+    
+    async def _athread_length(self, config: RunnableConfig) -> int:
+        """Async variant of _thread_length."""
+        snapshot = await self.app.aget_state(config)
+        return len(snapshot.values.get("messages", [])) if snapshot else 0
+    
+    def _cached_turn(self, user_input: str, thread_id: str, config: RunnableConfig) -> tuple[int, str | None]:
+        """
+        Look up an exact retry of the previous turn in the response cache.
+        
+        Returns the thread's current message count (so callers can key the turn they
+        run without re-reading the checkpoint) and the cached reply, if any. A hit is
+        still written to the checkpoint, so the thread history (and get_history)
+        matches what the user saw.
+        """
+        position = self._thread_length(config)
+        cached = self._get_cached_response(self._cache_key(user_input, thread_id, position))
+        if cached is None:
+            return position, None
+        _log.info(f"Response cache hit (thread: {hash_thread_id(thread_id, 8)})")
+        self.app.update_state(
+            config,
+            {"messages": [HumanMessage(content=user_input), AIMessage(content=cached)]},
+            as_node="agent",
+        )
+        self._cache_response(self._cache_key(user_input, thread_id, position + 2), cached)
+        return position, cached
+    
+    async def _acached_turn(self, user_input: str, thread_id: str, config: RunnableConfig) -> tuple[int, str | None]:
+        """Async variant of _cached_turn."""
+        position = await self._athread_length(config)
+        cached = self._get_cached_response(self._cache_key(user_input, thread_id, position))
+        if cached is None:
+            return position, None
+        _log.info(f"Response cache hit (thread: {hash_thread_id(thread_id, 8)})")
+        await self.app.aupdate_state(
+            config,
+            {"messages": [HumanMessage(content=user_input), AIMessage(content=cached)]},
+            as_node="agent",
+        )
+        self._cache_response(self._cache_key(user_input, thread_id, position + 2), cached)
+        return position, cached
+    
+    def _get_cached_response(self, key: tuple[str, int, str]) -> str | None:
+        """Return a cached response and mark it as most recently used."""
+        with self._response_cache_lock:
+            response = self._response_cache.get(key)
+            if response is not None:
+                self._response_cache.move_to_end(key)
+            return response
+    
+    def _cache_response(self, key: tuple[str, int, str], response: str) -> None:
+        """Store a response, evicting the least recently used entry when full."""
+        with self._response_cache_lock:
+            self._response_cache[key] = response
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+    
     def _create_graph(self) -> StateGraph:
         """Create the LangGraph workflow."""
         # Create the graph
         workflow = StateGraph(AgentState)
         
         # Add nodes
-        workflow.add_node("agent", self._call_model)
-        workflow.add_node("tools", ToolNode(LIBRARY_TOOLS))
+        # Sync and async model calls share one node so invoke/ainvoke both work.
+        # No node cache: its key is the full state, which never repeats within a thread.
+        workflow.add_node(
+            "agent",
+            RunnableLambda(self._call_model, afunc=self._acall_model, name="agent"),
+        )
+        # ToolNode runs all tool calls from one AI message concurrently (thread pool on
+        # invoke, asyncio.gather on ainvoke); failures become ToolMessages, not exceptions
+        workflow.add_node("tools", ToolNode(LIBRARY_TOOLS, handle_tool_errors=True))
         
         # Define the flow
         workflow.set_entry_point("agent")
@@ -139,26 +515,133 @@ class ScholarAgent:
         
         return workflow
     
-    def _call_model(self, state: AgentState) -> AgentState:
+    def _summary_window(self, state: AgentState) -> tuple[int, int] | None:
+        """
+        Return the (start, end) slice of messages to fold into the summary, or None
+        if the unsummarized history is still short. The slice ends on a HumanMessage
+        so whole turns (including tool call/result pairs) stay together.
+        """
+        messages = state["messages"]
+        done = state.get("summarized_upto", 0)
+        if len(messages) - done <= SUMMARIZE_AFTER_MESSAGES:
+            return None
+        cut = len(messages) - KEEP_RECENT_MESSAGES
+        while cut > done and type(messages[cut]) is not HumanMessage:
+            cut -= 1
+        return (done, cut) if cut > done else None
+    
+    def _summary_request(self, state: AgentState, start: int, end: int) -> list[BaseMessage]:
+        """Build the summarizer prompt extending the current summary with messages[start:end]."""
+        return [
+            SystemMessage(content=CONVERSATION_SUMMARY_PROMPT),
+            HumanMessage(content=(
+                f"Current summary:\n{state.get('summary') or '(none)'}\n\n"
+                f"New conversation lines:\n{_transcript(state['messages'][start:end])}"
+            )),
+        ]
+    
+    def _summarize(self, state: AgentState) -> dict:
+        """Return a state update with a refreshed summary, or {} when none is needed."""
+        window = self._summary_window(state)
+        if window is None:
+            return {}
+        try:
+            # Tagged nostream so summary tokens never reach stream_chat output
+            result = self.llm_summarizer.invoke(
+                self._summary_request(state, *window), config={"tags": [TAG_NOSTREAM]}
+            )
+        except Exception:
+            _log.exception("Conversation summarization failed; sending recent history only")
+            return {}
+        _log.info(f"Summarized messages {window[0]}-{window[1]}")
+        return {"summary": (result.content or "").strip(), "summarized_upto": window[1]}
+    
+    async def _asummarize(self, state: AgentState) -> dict:
+        """Async variant of _summarize."""
+        window = self._summary_window(state)
+        if window is None:
+            return {}
+        try:
+            result = await self.llm_summarizer.ainvoke(
+                self._summary_request(state, *window), config={"tags": [TAG_NOSTREAM]}
+            )
+        except Exception:
+            _log.exception("Conversation summarization failed; sending recent history only")
+            return {}
+        _log.info(f"Summarized messages {window[0]}-{window[1]}")
+        return {"summary": (result.content or "").strip(), "summarized_upto": window[1]}
+    
+    def _prepare_messages(self, state: AgentState, update: dict) -> list[BaseMessage]:
+        """
+        Return the messages to send to the LLM: the static system prompt, the
+        per-thread context (summary + search slots), then the unsummarized history.
+        
+        Stable content comes first so the provider can cache the prefix (tool schemas +
+        system prompt); nothing dynamic (timestamps, ids) is ever added to it.
+        """
+        messages = state["messages"]
+        summary = update.get("summary", state.get("summary", ""))
+        start = update.get("summarized_upto", state.get("summarized_upto", 0))
+        
+        # Add system prompt if missing (it is always the first message when present)
+        system = self._system_message
+        if messages and type(messages[0]) is SystemMessage:
+            system, start = messages[0], max(start, 1)
+        
+        prepared = [system]
+        context = _context_message(summary, _search_slots(messages))
+        if context is not None:
+            prepared.append(context)
+        prepared.extend(_trim_history(messages[start:]))
+        
+        _log.info(f"Calling LLM with {len(prepared)} messages")
+        return prepared
+    
+    def _select_llm(self, state: AgentState) -> Runnable:
+        """
+        Pick the LLM for this step: the responder right after tool results (to
+        present them), otherwise the tool-calling router.
+        """
+        messages = state["messages"]
+        respond = bool(messages) and type(messages[-1]) is ToolMessage
+        return self.llm_responder if respond else self.llm_router
+    
+    @staticmethod
+    def _request_kwargs(config: RunnableConfig) -> dict:
+        """
+        Per-request API parameters. A hash of the thread ID is sent as the stable `user`
+        identifier so the provider can route a conversation's requests together and
+        reuse its cached prompt prefix (the system prompt itself is never modified).
+        """
+        thread_id = (config or {}).get("configurable", {}).get("thread_id")
+        return {"user": hash_thread_id(thread_id)} if thread_id else {}
+    
+    def _call_model(self, state: AgentState, config: RunnableConfig) -> AgentState:
         """
         Call the LLM with the current state.
         
         Args:
             state: Current agent state with messages
+            config: Run config (carries thread_id)
             
         Returns:
             Updated state with new message
         """
-        messages = state["messages"]
-        
-        # Add system prompt if this is the start
-        if not any(isinstance(m, SystemMessage) for m in messages):
-            messages = [SystemMessage(content=self.system_prompt)] + list(messages)
+        update = self._summarize(state)
+        response = self._select_llm(state).invoke(
+            self._prepare_messages(state, update), **self._request_kwargs(config)
+        )
         
-        _log.info(f"Calling LLM with {len(messages)} messages")
-        response = self.llm.invoke(messages)
+        return {"messages": [response], **update}
+    
+    async def _acall_model(self, state: AgentState, config: RunnableConfig) -> AgentState:
+        """Async variant of _call_model, used when the graph runs via ainvoke/astream."""
+        update = await self._asummarize(state)
+        response = await self._select_llm(state).ainvoke(
+            self._prepare_messages(state, update), **self._request_kwargs(config)
+        )
         
-        return {"messages": [response]}
+        return {"messages": [response], **update}
     
     def _should_continue(self, state: AgentState) -> str:
         """
@@ -174,14 +657,28 @@ class ScholarAgent:
         last_message = messages[-1]
         
         # If there are tool calls, continue
-        if hasattr(last_message, "tool_calls") and last_message.tool_calls:
-            _log.info(f"Tool calls detected: {len(last_message.tool_calls)}")
+        tool_calls = getattr(last_message, "tool_calls", None)
+        if tool_calls:
+            if _log.isEnabledFor(logging.INFO):
+                _log.info(f"Tool calls detected: {len(tool_calls)}")
             return "continue"
         
         # Otherwise end
         _log.info("No tool calls, ending")
         return "end"
     
+    @staticmethod
+    def _turn_tool_parts(messages: Sequence[BaseMessage]) -> list[str]:
+        """Return the tool outputs produced after the last HumanMessage in a thread."""
+        tool_parts = []
+        for m in reversed(messages):
+            if type(m) is HumanMessage:
+                break
+            if type(m) is ToolMessage and m.content:
+                tool_parts.append(m.content)
+        tool_parts.reverse()
+        return tool_parts
+    
     def chat(self, user_input: str, thread_id: str = "default") -> str:
         """
         Process a user message and return the agent's response.
@@ -193,7 +690,7 @@ class ScholarAgent:
         Returns:
             Agent's response text
         """
-        _log.info(f"Processing user input (thread: {thread_id}): {user_input[:100]}...")
+        _log.info(f"Processing user input (thread: {hash_thread_id(thread_id, 8)}): {user_input[:100]}...")
         
         try:
             # Create the input state
@@ -204,28 +701,29 @@ class ScholarAgent:
             # Configure with thread ID for memory
             config = {"configurable": {"thread_id": thread_id}}
             
-            # Invoke the agent
-            result = self.app.invoke(input_state, config)
-            messages = result["messages"]
-
-            # Include any tool results from this turn so the user always sees search results
-            # (the LLM sometimes replies with only a follow-up question and omits the results)
-            last_human_idx = next((i for i in range(len(messages) - 1, -1, -1) if isinstance(messages[i], HumanMessage)), None)
+            position, cached = self._cached_turn(user_input, thread_id, config)
+            if cached is not None:
+                return cached
+            
+            # Stream node updates so tool results are collected as soon as the
+            # tools node finishes, without re-reading the whole thread history
             tool_parts = []
-            if last_human_idx is not None:
-                for m in messages[last_human_idx + 1 :]:
-                    if isinstance(m, ToolMessage) and getattr(m, "content", None):
+            final_message = None
+            added = 1  # the HumanMessage
+            for chunk in self.app.stream(input_state, config, stream_mode="updates"):
+                tool_messages = (chunk.get("tools") or {}).get("messages", [])
+                added += len(tool_messages)
+                for m in tool_messages:
+                    if type(m) is ToolMessage and m.content:
                         tool_parts.append(m.content)
+                agent_messages = (chunk.get("agent") or {}).get("messages", [])
+                added += len(agent_messages)
+                if agent_messages:
+                    final_message = agent_messages[-1]
 
-            final_message = messages[-1]
-            if isinstance(final_message, AIMessage):
-                response = (final_message.content or "").strip()
-            else:
-                response = str(final_message).strip()
-
-            if tool_parts:
-                response = "\n\n".join(tool_parts) + ("\n\n---\n\n" + response if response else "")
+            response = _compose_response(tool_parts, final_message)
             _log.info(f"Agent response: {response[:100]}...")
+            self._cache_response(self._cache_key(user_input, thread_id, position + added), response)
             return response
             
         except Exception as e:
@@ -236,6 +734,11 @@ class ScholarAgent:
         """
         Stream the agent's response token by token.
         
+        Tool results are yielded as soon as the tools node finishes, followed by the
+        reply tokens, in the same layout as chat(). Any text the model writes before
+        calling tools is shown too, separated from the results; the cached reply
+        matches chat() exactly.
+        
         Args:
             user_input: User's message
             thread_id: Thread ID for conversation tracking
@@ -243,7 +746,7 @@ class ScholarAgent:
         Yields:
             Response tokens as they're generated
         """
-        _log.info(f"Streaming response for input (thread: {thread_id}): {user_input[:100]}...")
+        _log.info(f"Streaming response for input (thread: {hash_thread_id(thread_id, 8)}): {user_input[:100]}...")
         
         try:
             # Create the input state
@@ -254,20 +757,212 @@ class ScholarAgent:
             # Configure with thread ID for memory
             config = {"configurable": {"thread_id": thread_id}}
             
-            # Stream the response
-            for chunk in self.app.stream(input_state, config):
-                # Extract messages from the chunk
-                if "agent" in chunk:
-                    messages = chunk["agent"].get("messages", [])
-                    if messages:
-                        message = messages[-1]
-                        if isinstance(message, AIMessage) and message.content:
-                            yield message.content
+            position, cached = self._cached_turn(user_input, thread_id, config)
+            if cached is not None:
+                yield cached
+                return
+            
+            # Stream LLM tokens plus node updates (tool results, finished agent steps)
+            assembler = _StreamAssembler()
+            for mode, payload in self.app.stream(input_state, config, stream_mode=["messages", "updates"]):
+                piece = assembler.feed(mode, payload)
+                if piece:
+                    yield piece
+            
+            response = assembler.text()
+            if response:
+                self._cache_response(self._cache_key(user_input, thread_id, position + 1 + assembler.added), response)
                         
         except Exception as e:
             _log.exception("Error streaming response")
             yield _user_facing_error(e)
     
+    async def achat(self, user_input: str, thread_id: str = "default") -> str:
+        """
+        Async version of chat(), for serving many threads from one event loop.
+        
+        Args:
+            user_input: User's message
+            thread_id: Thread ID for conversation tracking (enables stateful conversations)
+            
+        Returns:
+            Agent's response text
+        """
+        _log.info(f"Processing user input async (thread: {hash_thread_id(thread_id, 8)}): {user_input[:100]}...")
+        
+        try:
+            input_state = {
+                "messages": [HumanMessage(content=user_input)]
+            }
+            config = {"configurable": {"thread_id": thread_id}}
+            
+            cached = (await self._acached_turn(user_input, thread_id, config))[1]
+            if cached is not None:
+                return cached
+            
+            result = await self.app.ainvoke(input_state, config)
+            messages = result["messages"]
+            
+            response = _compose_response(self._turn_tool_parts(messages), messages[-1])
+            _log.info(f"Agent response: {response[:100]}...")
+            # The result already holds the whole thread, so no checkpoint read is needed
+            self._cache_response(self._cache_key(user_input, thread_id, len(messages)), response)
+            return response
+            
+        except Exception as e:
+            _log.exception("Error processing message")
+            return _user_facing_error(e)
+    
+    async def astream_chat(self, user_input: str, thread_id: str = "default"):
+        """
+        Async version of stream_chat().
+        
+        Args:
+            user_input: User's message
+            thread_id: Thread ID for conversation tracking
+            
+        Yields:
+            Response tokens as they're generated
+        """
+        _log.info(f"Streaming response async for input (thread: {hash_thread_id(thread_id, 8)}): {user_input[:100]}...")
+        
+        try:
+            input_state = {
+                "messages": [HumanMessage(content=user_input)]
+            }
+            config = {"configurable": {"thread_id": thread_id}}
+            
+            position, cached = await self._acached_turn(user_input, thread_id, config)
+            if cached is not None:
+                yield cached
+                return
+            
+            assembler = _StreamAssembler()
+            async for mode, payload in self.app.astream(input_state, config, stream_mode=["messages", "updates"]):
+                piece = assembler.feed(mode, payload)
+                if piece:
+                    yield piece
+            
+            response = assembler.text()
+            if response:
+                self._cache_response(self._cache_key(user_input, thread_id, position + 1 + assembler.added), response)
+                        
+        except Exception as e:
+            _log.exception("Error streaming response")
+            yield _user_facing_error(e)
+    
+    def batch_chat(
+        self,
+        inputs: list[tuple[str, str]],
+        poll_interval: float = 30.0,
+        timeout: float | None = None,
+    ) -> dict[str, str]:
+        """
+        Answer many independent, non-interactive queries through the OpenAI Batch API.
+        
+        Batch requests are billed at a discount but complete within 24h, so this is meant
+        for offline workloads (e.g. pre-building reading lists). Each query is a single
+        system + user turn: no tool calls and no conversation memory.
+        
+        Args:
+            inputs: (custom_id, user_input) pairs; custom_id must be unique (e.g. a thread ID)
+            poll_interval: Seconds between batch status checks
+            timeout: Maximum seconds to wait for the batch, or None to wait indefinitely
+            
+        Returns:
+            Mapping of custom_id to response text for requests that succeeded
+        """
+        if self.provider != "openai":
+            raise ValueError("batch_chat is only supported for provider='openai'")
+        ids = [custom_id for custom_id, _ in inputs]
+        if len(set(ids)) != len(ids):
+            raise ValueError("batch_chat inputs must have unique custom_id values")
+        if not inputs:
+            return {}
+        
+        from openai import OpenAI
+        
+        client = OpenAI()
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model_name,
+                    "temperature": self.temperature,
+                    "messages": [
+                        {"role": "system", "content": self.system_prompt},
+                        {"role": "user", "content": user_input},
+                    ],
+                },
+            })
+            for custom_id, user_input in inputs
+        ]
+        batch_file = client.files.create(
+            file=("scholarbot_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        _log.info(f"Submitted batch {batch.id} with {len(inputs)} requests")
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Batch {batch.id} still {batch.status} after {timeout}s")
+            time.sleep(poll_interval)
+            batch = client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+        
+        responses = {}
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            body = (record.get("response") or {}).get("body") or {}
+            choices = body.get("choices") or []
+            if record.get("error") or not choices:
+                _log.error(f"Batch request {record.get('custom_id')} failed: {record.get('error')}")
+                continue
+            responses[record["custom_id"]] = (choices[0]["message"].get("content") or "").strip()
+        
+        _log.info(f"Batch {batch.id} completed: {len(responses)}/{len(inputs)} succeeded")
+        return responses
+    
+    def get_history(self, thread_id: str = "default") -> list[dict[str, str]]:
+        """
+        Return a thread's visible turns from the checkpointer, e.g. to redraw a chat after a page reload.
+        
+        Args:
+            thread_id: Thread ID to read
+            
+        Returns:
+            {"role": "user" | "assistant", "content": str} dicts in conversation order
+        """
+        snapshot = self.app.get_state({"configurable": {"thread_id": thread_id}})
+        messages = snapshot.values.get("messages", []) if snapshot else []
+        history = []
+        tool_parts: list[str] = []
+        for m in messages:
+            if type(m) is HumanMessage:
+                history.append({"role": "user", "content": m.content})
+                tool_parts = []
+            elif type(m) is ToolMessage:
+                if m.content:
+                    tool_parts.append(m.content)
+            elif isinstance(m, AIMessage) and not m.tool_calls:
+                # Rebuild the reply as it was shown, with the turn's search results first
+                reply = _compose_response(tool_parts, m)
+                if reply:
+                    history.append({"role": "assistant", "content": reply})
+        return history
+    
     def reset_conversation(self, thread_id: str = "default"):
         """
         Reset the conversation history for a thread.
@@ -275,10 +970,17 @@ class ScholarAgent:
         Args:
             thread_id: Thread ID to reset
         """
-        _log.info(f"Resetting conversation for thread: {thread_id}")
-        # Note: MemorySaver doesn't have a direct clear method
-        # The conversation is effectively reset by using a new thread_id
-        pass
+        _log.info(f"Resetting conversation for thread: {hash_thread_id(thread_id, 8)}")
+        with self._response_cache_lock:
+            for key in [k for k in self._response_cache if k[0] == thread_id]:
+                self._response_cache.pop(key, None)
+        try:
+            self.memory.delete_thread(thread_id)
+        except NotImplementedError:
+            _log.warning(
+                f"{type(self.memory).__name__} does not support deleting threads; "
+                f"checkpoints for thread {hash_thread_id(thread_id, 8)} are kept"
+            )
 
 
 # Factory function for easy instantiation
@@ -286,6 +988,7 @@ def create_scholar_agent(
     model_name: str | None = None,
     temperature: float | None = None,
     provider: str | None = None,
+    memory: BaseCheckpointSaver | None = None,
 ) -> ScholarAgent:
     """
     Create a ScholarAgent instance.
@@ -294,10 +997,11 @@ def create_scholar_agent(
         model_name: Override model (defaults from GROQ_MODEL or OPENAI_MODEL per provider).
         temperature: Model temperature (defaults from OPENAI_TEMPERATURE or 0.7).
         provider: "groq" or "openai" (defaults from LLM_PROVIDER env, then "groq").
+        memory: Checkpointer (defaults to the shared one from SCHOLARBOT_CHECKPOINT_BACKEND).
 
     Returns:
         Initialized ScholarAgent
     """
     if temperature is None:
         temperature = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
-    return ScholarAgent(model_name=model_name, temperature=temperature, provider=provider)
+    return ScholarAgent(model_name=model_name, temperature=temperature, provider=provider, memory=memory)
@@ -2,9 +2,10 @@
 import streamlit as st
 import os
 from dotenv import load_dotenv
-from agents.scholar_agent import create_scholar_agent
+from agents.scholar_agent import create_scholar_agent, hash_thread_id
 from core.utils.logging_utils import get_logger
-import uuid
+import secrets
+from pathlib import Path
 
 # Load environment variables
 load_dotenv()
@@ -20,59 +21,77 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+
+@st.cache_data
+def _load_css() -> str:
+    """Read the app stylesheet once per process instead of on every rerun."""
+    return f"<style>\n{(Path(__file__).parent / '.streamlit' / 'style.css').read_text(encoding='utf-8')}</style>"
+
+
 # Custom CSS for better UI
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #1E40AF;
-        text-align: center;
-        margin-bottom: 0.5rem;
-    }
-    .sub-header {
-        font-size: 1.2rem;
-        color: #64748B;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .chat-message {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin-bottom: 1rem;
-    }
-    .user-message {
-        background-color: #E0F2FE;
-        border-left: 4px solid #0EA5E9;
-    }
-    .bot-message {
-        background-color: #F1F5F9;
-        border-left: 4px solid #64748B;
-    }
-    .stButton>button {
-        width: 100%;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(_load_css(), unsafe_allow_html=True)
+
+
+@st.cache_resource
+def _provider_settings() -> tuple[str, str]:
+    """Return (provider, model) from the environment, resolved once per process."""
+    provider = (os.getenv("LLM_PROVIDER") or "groq").lower()
+    model = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant") if provider == "groq" else os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    return provider, model
+
+
+@st.cache_resource
+def _api_key_error() -> str | None:
+    """Return an error message if the selected provider's API key is missing."""
+    provider, _ = _provider_settings()
+    if provider == "groq":
+        if not os.getenv("GROQ_API_KEY"):
+            return "⚠️ GROQ_API_KEY not found. Set it in .env or get a key at https://console.groq.com/keys"
+    else:
+        if not os.getenv("OPENAI_API_KEY"):
+            return "⚠️ OPENAI_API_KEY not found. Set it in .env or get a key at https://platform.openai.com/api-keys"
+    return None
+
+
+def _new_thread_id() -> str:
+    """
+    Return a new conversation thread ID for the LangGraph checkpointer.
+    
+    The ID is also the ?thread= URL parameter that reopens the conversation, so it
+    must be unguessable.
+    """
+    return secrets.token_urlsafe(16)
+
+
+@st.cache_resource
+def _get_agent():
+    """Return the process-wide agent; conversations stay isolated per session via thread_id."""
+    return create_scholar_agent()
 
 
 def initialize_session_state():
     """Initialize Streamlit session state variables."""
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
-    
     if "thread_id" not in st.session_state:
-        st.session_state.thread_id = str(uuid.uuid4())
+        # The thread ID lives in the URL so a browser refresh resumes the same conversation
+        st.session_state.thread_id = st.query_params.get("thread") or _new_thread_id()
+        st.query_params["thread"] = st.session_state.thread_id
     
     if "agent" not in st.session_state:
         with st.spinner("Initializing ScholarBot..."):
             try:
-                st.session_state.agent = create_scholar_agent()
+                st.session_state.agent = _get_agent()
                 _log.info("Agent initialized successfully")
             except Exception as e:
                 st.error(f"Failed to initialize agent: {e}")
                 _log.error(f"Agent initialization failed: {e}")
                 st.stop()
+    
+    if "messages" not in st.session_state:
+        try:
+            st.session_state.messages = st.session_state.agent.get_history(st.session_state.thread_id)
+        except Exception as e:
+            _log.error(f"Could not restore history for thread {hash_thread_id(st.session_state.thread_id, 8)}: {e}")
+            st.session_state.messages = []
 
 
 def display_chat_history():
@@ -125,14 +144,19 @@ def main():
         
         # Model settings
         st.subheader("⚙️ Settings")
-        provider = (os.getenv("LLM_PROVIDER") or "groq").lower()
-        model = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant") if provider == "groq" else os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        provider, model = _provider_settings()
         st.info(f"**Provider:** {provider.title()}\n**Model:** {model}")
         
         # Clear conversation button
         if st.button("🗑️ Clear Conversation", use_container_width=True):
+            try:
+                # Drop the old thread so the checkpoint store doesn't grow forever
+                st.session_state.agent.reset_conversation(st.session_state.thread_id)
+            except Exception as e:
+                _log.error(f"Failed to delete thread {hash_thread_id(st.session_state.thread_id, 8)}: {e}")
             st.session_state.messages = []
-            st.session_state.thread_id = str(uuid.uuid4())
+            st.session_state.thread_id = _new_thread_id()
+            st.query_params["thread"] = st.session_state.thread_id
             st.rerun()
         
         st.divider()
@@ -140,7 +164,7 @@ def main():
         # Stats
         st.subheader("📊 Conversation Stats")
         st.metric("Messages", len(st.session_state.messages))
-        st.metric("Thread ID", st.session_state.thread_id[:8] + "...")
+        st.metric("Thread ID", "..." + st.session_state.thread_id[-8:])
         
         st.divider()
         
@@ -174,14 +198,15 @@ def main():
             full_response = ""
             
             try:
-                # Stream the response
-                with st.spinner("Thinking..."):
-                    response = st.session_state.agent.chat(
-                        prompt,
-                        thread_id=st.session_state.thread_id
-                    )
-                    full_response = response
-                    message_placeholder.markdown(full_response)
+                # Stream the response, rendering each token as it arrives
+                message_placeholder.markdown("Thinking...")
+                for chunk in st.session_state.agent.stream_chat(
+                    prompt,
+                    thread_id=st.session_state.thread_id
+                ):
+                    full_response += chunk
+                    message_placeholder.markdown(full_response + "▌")
+                message_placeholder.markdown(full_response)
                 
             except Exception as e:
                 error_msg = f"❌ Error: {str(e)}"
@@ -194,13 +219,10 @@ def main():
 
 
 if __name__ == "__main__":
-    provider = (os.getenv("LLM_PROVIDER") or "groq").lower()
-    if provider == "groq":
-        if not os.getenv("GROQ_API_KEY"):
-            st.error("⚠️ GROQ_API_KEY not found. Set it in .env or get a key at https://console.groq.com/keys")
-            st.stop()
-    else:
-        if not os.getenv("OPENAI_API_KEY"):
-            st.error("⚠️ OPENAI_API_KEY not found. Set it in .env or get a key at https://platform.openai.com/api-keys")
-            st.stop()
+    api_key_error = _api_key_error()
+    if api_key_error:
+        # Don't cache a failed check, so adding the key to .env works on the next rerun
+        _api_key_error.clear()
+        st.error(api_key_error)
+        st.stop()
     main()
@@ -1,7 +1,10 @@
 # core/clients/csusb_library_client.py
 import json
 import os
-from typing import Any, Dict, List, Optional
+import threading
+from contextlib import nullcontext
+from concurrent.futures import Future
+from typing import Any, ContextManager, Dict, List, Optional
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -18,11 +21,13 @@ DATA_DIR    = os.getenv("DATA_DIR", "/data")
 if os.name == "posix" and (":" in DATA_DIR or DATA_DIR.startswith(("C:\\", "C:/"))):
     DATA_DIR = "/data"
 PRIMO_TIMEOUT = int(os.getenv("PRIMO_PUBLIC_TIMEOUT", "20"))
+PRIMO_POOL_SIZE = int(os.getenv("PRIMO_POOL_SIZE", "10"))
 
 def _session() -> requests.Session:
     s = requests.Session()
     r = Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"])
-    s.mount("https://", HTTPAdapter(max_retries=r))
+    # Keep enough pooled keep-alive connections for concurrent tool calls
+    s.mount("https://", HTTPAdapter(max_retries=r, pool_connections=PRIMO_POOL_SIZE, pool_maxsize=PRIMO_POOL_SIZE))
     s.headers.update({"Accept": "application/json", "User-Agent": "ScholarBot/1.0"})
     return s
 
@@ -132,11 +137,11 @@ class CSUSBLibraryClient(ILibraryClient):
         # Add date range filter if specified (year or YYYYMMDD accepted)
         if date_from is not None or date_to is not None:
             # Normalize bounds using shared utility
-            start_str = normalize_date_bound(date_from, True)
-            end_str = normalize_date_bound(date_to, False)
+            today = _get_today_yyyymmdd()
+            start_str = normalize_date_bound(date_from, True, today)
+            end_str = normalize_date_bound(date_to, False, today)
 
             # Clamp future dates to today
-            today = _get_today_yyyymmdd()
             try:
                 if end_str and end_str.isdigit() and int(end_str) > int(today):
                     _log.info(f"Clamping end date {end_str} to today {today}")
@@ -180,6 +185,74 @@ class CSUSBLibraryClient(ILibraryClient):
             raise
 
 
+class CoalescingCSUSBClient(ILibraryClient):
+    """
+    Library client that coalesces identical concurrent searches (single-flight).
+    
+    When several tool calls (or users) issue the same search while one is already
+    in flight, they wait for that request's result instead of sending their own.
+    Different searches are not merged; each still makes its own Primo request.
+    Implements ILibraryClient, so it is a drop-in wrapper around CSUSBLibraryClient.
+    """
+    
+    def __init__(self, client: Optional[ILibraryClient] = None, limiter: Optional[ContextManager] = None):
+        """
+        Wrap `client` (defaults to a new CSUSBLibraryClient).
+        
+        `limiter` (e.g. a BoundedSemaphore) is held only while a request is actually
+        sent, so callers waiting on an in-flight search don't use up its slots.
+        """
+        self.client = client or CSUSBLibraryClient()
+        self.limiter = limiter if limiter is not None else nullcontext()
+        self._inflight: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+    
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        offset: int = 0,
+        resource_type: Optional[str] = None,
+        date_from: Optional[int] = None,
+        date_to: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Search the library database, sharing the result with identical in-flight searches.
+        Implements ILibraryClient.search() interface.
+        """
+        key = (query, limit, offset, resource_type, date_from, date_to)
+        with self._lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[key] = future
+        
+        if not is_leader:
+            _log.info(f"Joining in-flight Primo search: {key}")
+            return future.result()
+        
+        try:
+            with self.limiter:
+                result = self.client.search(
+                    query=query,
+                    limit=limit,
+                    offset=offset,
+                    resource_type=resource_type,
+                    date_from=date_from,
+                    date_to=date_to,
+                )
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
 # Legacy function for backward compatibility
 def explore_search(
     q: str | None = None,
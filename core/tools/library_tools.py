@@ -1,12 +1,44 @@
 # core/tools/library_tools.py
+import asyncio
+import io
+import os
+import threading
 from typing import Optional, Any, Dict
-from langchain_core.tools import tool
+from cachetools import TTLCache
+from langchain_core.tools import StructuredTool
 from pydantic import BaseModel, Field
-from core.clients.csusb_library_client import CSUSBLibraryClient
+from core.clients.csusb_library_client import CoalescingCSUSBClient, CSUSBLibraryClient
 from core.utils.logging_utils import get_logger
+from core.utils.semantic_cache import SemanticCache
 
 _log = get_logger(__name__)
 
+# Formatted search results keyed by (query, resource_type, date_from, date_to, limit);
+# entries expire so repeated searches within a session skip the Primo round trip
+# while results stay reasonably fresh
+SEARCH_CACHE_TTL = 15 * 60
+_SEARCH_CACHE: TTLCache = TTLCache(maxsize=512, ttl=SEARCH_CACHE_TTL)
+_SEARCH_CACHE_LOCK = threading.Lock()
+
+# Upper bound on concurrent Primo requests across sync and async tool calls
+PRIMO_MAX_CONCURRENCY = 5
+_PRIMO_SLOTS = threading.BoundedSemaphore(PRIMO_MAX_CONCURRENCY)
+
+# Shared client: it holds only configuration plus the module-level pooled session,
+# so it is safe to use from concurrent tool calls without a lock. Identical searches
+# issued concurrently (e.g. in one agent turn) share a single Primo request, and only
+# that request takes a concurrency slot.
+_CLIENT = CoalescingCSUSBClient(CSUSBLibraryClient(), limiter=_PRIMO_SLOTS)
+
+# Optional semantic cache so paraphrased queries ("ML papers" / "machine learning
+# research") reuse results; off by default since it loads an embedding model
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+SEMANTIC_CACHE_PATH = os.getenv("SEMANTIC_CACHE_PATH") or None
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_init_done = False
+_semantic_cache_lock = threading.Lock()
+
 
 class LibrarySearchInput(BaseModel):
     """Input schema for library search tool."""
@@ -31,8 +63,140 @@ class LibrarySearchInput(BaseModel):
     )
 
 
-@tool(args_schema=LibrarySearchInput)
-def get_library_resources(
+def _search_impl(
+    query: str,
+    resource_type: Optional[str],
+    date_from: Optional[int],
+    date_to: Optional[int],
+    limit: int,
+) -> str:
+    """Run a library search and format the results; raises on client errors."""
+    # Perform search; the client holds a _PRIMO_SLOTS slot to respect Primo rate limits
+    results = _CLIENT.search(
+        query=query,
+        limit=limit,
+        resource_type=resource_type,
+        date_from=date_from,
+        date_to=date_to
+    )
+    
+    # Extract and format results
+    docs = results.get("docs", [])
+    total = results.get("info", {}).get("total", 0)
+    
+    if not docs:
+        return f"No resources found for query: '{query}'. Try broadening your search terms or removing filters."
+    
+    # Format results for display, writing every fragment into one buffer
+    buf = io.StringIO()
+    buf.write(f"Found {total} resources (showing {len(docs)}):\n")
+    
+    for idx, doc in enumerate(docs, 1):
+        pnx = doc.get("pnx", {})
+        display = pnx.get("display", {})
+        
+        # Extract key fields
+        title = display.get("title", ["Untitled"])[0]
+        creators = display.get("creator", [])
+        author = creators[0] if creators else "Unknown Author"
+        pub_date = display.get("creationdate", [""])[0]
+        resource_type_val = display.get("type", [""])[0]
+        
+        # Get URL: prefer the "View Online" link, else the first link
+        links = doc.get("delivery", {}).get("link", [])
+        url = next(
+            (link.get("linkURL", "") for link in links if link.get("displayLabel") == "View Online"),
+            "",
+        ) or (links[0].get("linkURL", "") if links else "")
+        
+        # Format entry
+        buf.write(f"\n\n{idx}. **{title}**")
+        if author:
+            buf.write(f"\n   Author: {author}")
+        if pub_date:
+            buf.write(f"\n   Year: {pub_date}")
+        if resource_type_val:
+            buf.write(f"\n   Type: {resource_type_val}")
+        if url:
+            buf.write(f"\n   URL: {url}")
+    
+    result_text = buf.getvalue()
+    _log.info(f"Successfully retrieved {len(docs)} results")
+    return result_text
+
+
+def _get_semantic_cache() -> Optional[SemanticCache]:
+    """Return the semantic cache, building it on first use; None when disabled or unavailable."""
+    global _semantic_cache, _semantic_cache_init_done
+    if not SEMANTIC_CACHE_ENABLED:
+        return None
+    with _semantic_cache_lock:
+        if not _semantic_cache_init_done:
+            _semantic_cache_init_done = True
+            try:
+                _semantic_cache = SemanticCache(
+                    threshold=SEMANTIC_CACHE_THRESHOLD,
+                    ttl=SEARCH_CACHE_TTL,
+                    path=SEMANTIC_CACHE_PATH,
+                )
+            except ImportError:
+                _log.error(
+                    "SEMANTIC_CACHE_ENABLED is set but sentence-transformers/faiss are not installed. "
+                    "Run: pip install sentence-transformers faiss-cpu"
+                )
+            except Exception as e:
+                # e.g. the embedding model cannot be downloaded; searches still work uncached
+                _log.error(f"Semantic cache disabled, failed to load: {e}")
+        return _semantic_cache
+
+
+def _search_and_cache(
+    query: str,
+    resource_type: Optional[str],
+    date_from: Optional[int],
+    date_to: Optional[int],
+    limit: int,
+) -> str:
+    """Return the cached result for a search, running and caching it on a miss."""
+    key = (query, resource_type, date_from, date_to, limit)
+    with _SEARCH_CACHE_LOCK:
+        cached = _SEARCH_CACHE.get(key)
+    if cached is not None:
+        _log.info(f"Library search cache hit: {key}")
+        return cached
+    _log.info(f"Library search cache miss: {key}")
+    
+    semantic_cache = _get_semantic_cache()
+    filters = key[1:]
+    if semantic_cache is not None:
+        try:
+            result_text = semantic_cache.get(query, filters)
+        except Exception as e:
+            _log.error(f"Semantic cache lookup failed: {e}")
+            result_text = None
+        if result_text is not None:
+            with _SEARCH_CACHE_LOCK:
+                _SEARCH_CACHE[key] = result_text
+            return result_text
+    
+    try:
+        result_text = _search_impl(query, resource_type, date_from, date_to, limit)
+    except Exception as e:
+        error_msg = f"Error searching library: {str(e)}"
+        _log.error(error_msg)
+        return error_msg
+    
+    with _SEARCH_CACHE_LOCK:
+        _SEARCH_CACHE[key] = result_text
+    if semantic_cache is not None:
+        try:
+            semantic_cache.set(query, filters, result_text)
+        except Exception as e:
+            _log.error(f"Semantic cache insert failed: {e}")
+    return result_text
+
+
+def _get_library_resources(
     query: str,
     resource_type: Optional[str] = None,
     date_from: Optional[int] = None,
@@ -56,73 +220,29 @@ def get_library_resources(
         Formatted string with search results including titles, authors, publication info, and URLs
     """
     _log.info(f"Library search - Query: {query}, Type: {resource_type}, Dates: {date_from}-{date_to}, Limit: {limit}")
-    
-    try:
-        # Initialize client
-        client = CSUSBLibraryClient()
-        
-        # Perform search
-        results = client.search(
-            query=query,
-            limit=limit,
-            resource_type=resource_type,
-            date_from=date_from,
-            date_to=date_to
-        )
-        
-        # Extract and format results
-        docs = results.get("docs", [])
-        total = results.get("info", {}).get("total", 0)
-        
-        if not docs:
-            return f"No resources found for query: '{query}'. Try broadening your search terms or removing filters."
-        
-        # Format results for display
-        formatted_results = [f"Found {total} resources (showing {len(docs)}):\n"]
-        
-        for idx, doc in enumerate(docs, 1):
-            pnx = doc.get("pnx", {})
-            display = pnx.get("display", {})
-            
-            # Extract key fields
-            title = display.get("title", ["Untitled"])[0]
-            creators = display.get("creator", [])
-            author = creators[0] if creators else "Unknown Author"
-            pub_date = display.get("creationdate", [""])[0]
-            resource_type_val = display.get("type", [""])[0]
-            
-            # Get URL
-            links = doc.get("delivery", {}).get("link", [])
-            url = ""
-            for link in links:
-                if link.get("displayLabel") == "View Online":
-                    url = link.get("linkURL", "")
-                    break
-            if not url and links:
-                url = links[0].get("linkURL", "")
-            
-            # Format entry
-            entry = f"\n{idx}. **{title}**"
-            if author:
-                entry += f"\n   Author: {author}"
-            if pub_date:
-                entry += f"\n   Year: {pub_date}"
-            if resource_type_val:
-                entry += f"\n   Type: {resource_type_val}"
-            if url:
-                entry += f"\n   URL: {url}"
-            
-            formatted_results.append(entry)
-        
-        result_text = "\n".join(formatted_results)
-        _log.info(f"Successfully retrieved {len(docs)} results")
-        return result_text
-        
-    except Exception as e:
-        error_msg = f"Error searching library: {str(e)}"
-        _log.error(error_msg)
-        return error_msg
+    return _search_and_cache(query, resource_type, date_from, date_to, limit)
+
+
+async def _aget_library_resources(
+    query: str,
+    resource_type: Optional[str] = None,
+    date_from: Optional[int] = None,
+    date_to: Optional[int] = None,
+    limit: int = 10
+) -> str:
+    """Async variant of the library search: runs the blocking HTTP call in a worker thread."""
+    _log.info(f"Library search (async) - Query: {query}, Type: {resource_type}, Dates: {date_from}-{date_to}, Limit: {limit}")
+    return await asyncio.to_thread(_search_and_cache, query, resource_type, date_from, date_to, limit)
+
+
+get_library_resources = StructuredTool.from_function(
+    func=_get_library_resources,
+    coroutine=_aget_library_resources,
+    name="get_library_resources",
+    args_schema=LibrarySearchInput,
+)
 
 
-# Export tools list for easy import
-LIBRARY_TOOLS = [get_library_resources]
+# Export tools list for easy import. Sorted by name so the tool schemas sent with
+# every request form a byte-identical prompt prefix (eligible for provider caching)
+LIBRARY_TOOLS = sorted([get_library_resources], key=lambda t: t.name)
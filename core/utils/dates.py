@@ -6,39 +6,27 @@ def _get_today_yyyymmdd() -> str:
     """Get today's date in YYYYMMDD format."""
     return datetime.now().strftime("%Y%m%d")
 
-def normalize_date_bound(date_value: Optional[int], is_start: bool) -> str:
+def normalize_date_bound(date_value: Optional[int], is_start: bool, today: Optional[str] = None) -> str:
     """
     Normalize a date boundary to YYYYMMDD format.
     
     Args:
         date_value: Year (YYYY) or date (YYYYMMDD) as integer
         is_start: True for start date (use Jan 1), False for end date (use Dec 31)
+        today: Today's date as YYYYMMDD, if the caller already computed it
     
     Returns:
         Date string in YYYYMMDD format
     """
-    if date_value is None:
-        # Return sensible defaults
-        if is_start:
-            return "19000101"  # Far past for start
-        else:
-            return _get_today_yyyymmdd()  # Today for end
-    
-    date_str = str(date_value)
-    
-    # If it's a 4-digit year
-    if len(date_str) == 4:
-        if is_start:
-            return f"{date_str}0101"  # January 1st
-        else:
-            return f"{date_str}1231"  # December 31st
+    # If it's a 4-digit year: January 1st / December 31st
+    if date_value is not None and 1000 <= date_value <= 9999:
+        return str(date_value * 10000 + (101 if is_start else 1231))
     
     # If it's already YYYYMMDD format
-    if len(date_str) == 8:
-        return date_str
+    if date_value is not None and 10000000 <= date_value <= 99999999:
+        return str(date_value)
     
-    # Invalid format - return safe default
+    # Missing or invalid - return sensible defaults: far past for start, today for end
     if is_start:
         return "19000101"
-    else:
-        return _get_today_yyyymmdd()
+    return today or _get_today_yyyymmdd()
@@ -1,13 +1,24 @@
 # core/utils/logging_utils.py
+import functools
 import logging
 import os
 import sys
 from typing import Optional
 
+# Formatters are stateless, so one instance is shared by every handler
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+
+@functools.lru_cache(maxsize=None)
 def get_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     """
     Get a configured logger instance.
     
+    Results are memoized per (name, level), so LOG_LEVEL is read on the first call only.
+    
     Args:
         name: Logger name (typically __name__)
         level: Log level (DEBUG, INFO, WARNING, ERROR). Defaults to LOG_LEVEL env var or INFO.
@@ -22,18 +33,13 @@ def get_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     
     # Only configure if not already configured
     if not logger.handlers:
-        logger.setLevel(getattr(logging, level.upper()))
+        log_level = getattr(logging, level.upper())
+        logger.setLevel(log_level)
         
         # Create console handler
         handler = logging.StreamHandler(sys.stdout)
-        handler.setLevel(getattr(logging, level.upper()))
-        
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        handler.setFormatter(formatter)
+        handler.setLevel(log_level)
+        handler.setFormatter(_FORMATTER)
         
         # Add handler to logger
         logger.addHandler(handler)
@@ -0,0 +1,151 @@
+# core/utils/semantic_cache.py
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Any, Optional
+from core.utils.logging_utils import get_logger
+
+_log = get_logger(__name__)
+
+
+class SemanticCache:
+    """
+    In-process cache keyed by query meaning instead of exact text.
+
+    Queries are embedded with a sentence-transformers model and stored in a FAISS
+    inner-product index over normalized vectors (inner product = cosine similarity).
+    A lookup hits when a stored query is at least `threshold` similar AND was cached
+    with exactly the same filters (e.g. resource type, date range, limit).
+
+    Entries are kept in insertion order, so expired or overflowing entries are always
+    a prefix and are evicted on insert. With a `path`, the index is written to disk
+    every `save_every` inserts and at interpreter exit, never on every miss.
+
+    Requires the optional packages `sentence-transformers` and `faiss-cpu`.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        threshold: float = 0.92,
+        ttl: Optional[float] = None,
+        path: Optional[str] = None,
+        max_entries: int = 5000,
+        search_k: int = 8,
+        save_every: int = 50,
+    ):
+        """
+        Initialize the cache, loading a persisted index from `path` if present.
+
+        Args:
+            model_name: sentence-transformers model used to embed queries
+            threshold: Minimum cosine similarity for a hit
+            ttl: Seconds an entry stays valid, or None for no expiry
+            path: FAISS index file to persist to (metadata is stored alongside as .json)
+            max_entries: Entries kept; the oldest are evicted beyond this
+            search_k: Nearest neighbours checked per lookup for a filter match
+            save_every: Inserts between writes to `path`
+        """
+        import faiss
+        from sentence_transformers import SentenceTransformer
+
+        self._faiss = faiss
+        self._model = SentenceTransformer(model_name)
+        self._dim = self._model.get_sentence_embedding_dimension()
+        self.threshold = threshold
+        self.ttl = ttl
+        self.path = path
+        self.max_entries = max_entries
+        self.search_k = search_k
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        # Serializes disk writes, which happen outside _lock
+        self._save_lock = threading.Lock()
+        self._unsaved = 0
+        self._index = faiss.IndexFlatIP(self._dim)
+        # Parallel to index rows: (filters, value, created_at)
+        self._entries: list[tuple[list[Any], str, float]] = []
+
+        if path and os.path.exists(path) and os.path.exists(path + ".json"):
+            try:
+                self._index = faiss.read_index(path)
+                with open(path + ".json", "r", encoding="utf-8") as f:
+                    self._entries = [tuple(e) for e in json.load(f)]
+                if self._index.ntotal != len(self._entries):
+                    raise ValueError("index/metadata size mismatch")
+                _log.info(f"Loaded semantic cache with {len(self._entries)} entries from {path}")
+            except Exception as e:
+                _log.error(f"Ignoring unreadable semantic cache at {path}: {e}")
+                self._index = faiss.IndexFlatIP(self._dim)
+                self._entries = []
+        if path:
+            atexit.register(self.flush)
+
+    def _embed(self, text: str):
+        """Embed a query as a normalized float32 row vector."""
+        return self._model.encode([text], normalize_embeddings=True).astype("float32")
+
+    def get(self, query: str, filters: tuple) -> Optional[str]:
+        """Return the value cached for a similar query with identical filters, if any."""
+        vector = self._embed(query)
+        wanted = list(filters)
+        now = time.time()
+        with self._lock:
+            if self._index.ntotal == 0:
+                return None
+            scores, ids = self._index.search(vector, min(self.search_k, self._index.ntotal))
+            for score, idx in zip(scores[0], ids[0]):
+                # Results are sorted by similarity, so stop at the first one below threshold
+                if idx < 0 or score < self.threshold:
+                    break
+                entry_filters, value, created_at = self._entries[idx]
+                if entry_filters == wanted and (self.ttl is None or now - created_at <= self.ttl):
+                    _log.info(f"Semantic cache hit (similarity {score:.3f}) for query: {query}")
+                    return value
+        return None
+
+    def set(self, query: str, filters: tuple, value: str) -> None:
+        """Cache a value for a query and its filters."""
+        vector = self._embed(query)
+        with self._lock:
+            self._evict(time.time())
+            self._index.add(vector)
+            self._entries.append((list(filters), value, time.time()))
+            self._unsaved += 1
+            due = bool(self.path) and self._unsaved >= self.save_every
+        if due:
+            self.flush()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries and make room for one insert (caller holds the lock)."""
+        drop = max(0, len(self._entries) + 1 - self.max_entries)
+        if self.ttl is not None:
+            while drop < len(self._entries) and now - self._entries[drop][2] > self.ttl:
+                drop += 1
+        if drop:
+            # Flat indexes renumber remaining vectors, keeping ids aligned with _entries
+            self._index.remove_ids(self._faiss.IDSelectorRange(0, drop))
+            del self._entries[:drop]
+
+    def flush(self) -> None:
+        """Persist the index and its metadata if there are unsaved inserts."""
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._unsaved:
+                    return
+                # Snapshot in memory so lookups and inserts never wait on disk I/O
+                data = self._faiss.serialize_index(self._index)
+                entries = list(self._entries)
+                self._unsaved = 0
+            try:
+                # serialize_index uses the write_index format, so read_index loads it
+                with open(self.path, "wb") as f:
+                    f.write(data.tobytes())
+                with open(self.path + ".json", "w", encoding="utf-8") as f:
+                    json.dump(entries, f)
+            except Exception as e:
+                _log.error(f"Failed to persist semantic cache to {self.path}: {e}")
@@ -5,6 +5,7 @@ Run this to test the agent functionality without the Streamlit UI.
 """
 import os
 from dotenv import load_dotenv
+from langgraph.checkpoint.memory import MemorySaver
 from agents.scholar_agent import create_scholar_agent
 from core.utils.logging_utils import get_logger
 
@@ -12,6 +13,18 @@ from core.utils.logging_utils import get_logger
 load_dotenv()
 _log = get_logger(__name__)
 
+# One agent shared by all tests; conversations are kept apart by thread_id. It keeps state
+# in memory so the fixed thread IDs below start fresh on every run.
+_AGENT = None
+
+
+def _agent():
+    """Return the shared test agent, creating it on first use."""
+    global _AGENT
+    if _AGENT is None:
+        _AGENT = create_scholar_agent(model_name="gpt-4o-mini", temperature=0.7, memory=MemorySaver())
+    return _AGENT
+
 
 def test_basic_search():
     """Test basic search functionality."""
@@ -19,7 +32,7 @@ def test_basic_search():
     print("TEST 1: Basic Search")
     print("="*60)
     
-    agent = create_scholar_agent(model_name="gpt-4", temperature=0.7)
+    agent = _agent()
     
     query = "Find papers on machine learning"
     print(f"\nUser: {query}")
@@ -33,7 +46,7 @@ def test_filtered_search():
     print("TEST 2: Filtered Search")
     print("="*60)
     
-    agent = create_scholar_agent(model_name="gpt-4", temperature=0.7)
+    agent = _agent()
     
     query = "Show me recent articles about climate change from 2023"
     print(f"\nUser: {query}")
@@ -47,7 +60,7 @@ def test_multi_turn_conversation():
     print("TEST 3: Multi-turn Conversation")
     print("="*60)
     
-    agent = create_scholar_agent(model_name="gpt-4", temperature=0.7)
+    agent = _agent()
     thread_id = "test3"
     
     # First turn
@@ -69,7 +82,7 @@ def test_clarifying_questions():
     print("TEST 4: Clarifying Questions")
     print("="*60)
     
-    agent = create_scholar_agent(model_name="gpt-4", temperature=0.7)
+    agent = _agent()
     
     # Vague query that should prompt clarification
     query = "Find papers by John Smith"
@@ -84,7 +97,7 @@ def test_resource_type_filter():
     print("TEST 5: Resource Type Filter")
     print("="*60)
     
-    agent = create_scholar_agent(model_name="gpt-4", temperature=0.7)
+    agent = _agent()
     
     query = "Find dissertations on artificial intelligence"
     print(f"\nUser: {query}")
@@ -99,7 +112,7 @@ def interactive_test():
     print("="*60)
     print("\nType your queries (or 'quit' to exit)\n")
     
-    agent = create_scholar_agent(model_name="gpt-4", temperature=0.7)
+    agent = _agent()
     thread_id = "interactive"
     
     while True: